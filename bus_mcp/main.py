@@ -0,0 +1,12 @@
+import logging
+
+from bus_mcp.server import mcp
+
+def run_server():
+    # stdout belongs to the stdio transport, so log to stderr instead
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("bus_mcp").info("Hello from bus-mcp!")
+    mcp.run(transport="stdio")
+
+if __name__ == "__main__":
+    run_server()
@@ -0,0 +1,23 @@
+"""JSON helpers: use orjson when installed, fall back to stdlib json.
+
+orjson is 3-10x faster at parsing/serializing the large number-heavy
+payloads OneBusAway returns, but keep the server importable without it.
+"""
+
+try:
+    import orjson as _orjson
+
+    loads = _orjson.loads
+
+    def dumps(obj) -> bytes:
+        """Serialize obj to JSON bytes"""
+        return _orjson.dumps(obj)
+
+except ImportError:
+    import json as _json
+
+    loads = _json.loads
+
+    def dumps(obj) -> bytes:
+        """Serialize obj to JSON bytes"""
+        return _json.dumps(obj).encode("utf-8")
@@ -0,0 +1,575 @@
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+from typing import Any, Dict, List, NamedTuple, Optional
+from mcp.server.fastmcp import FastMCP
+import asyncio
+import logging
+import aiofiles
+import aiohttp
+import ijson
+import numpy as np
+from cachetools import LRUCache, TTLCache
+from bus_mcp.serialization import loads as json_loads, dumps as json_dumps
+from dotenv import load_dotenv
+import os
+import time
+# global variables
+ONE_BUS_AWAY_BASE_URL = "https://api.pugetsound.onebusaway.org/api"
+CURR_TIMESTAMP_API ="where/current-time.json"
+
+# load environment variables
+ARRIVALS_AND_DEPARTURES_API="arrivals-and-departures-for-stop/{stop_id}.json"
+# built once at import; per call we only .format() the stop id or pass params
+CURR_TIME_URL = f"{ONE_BUS_AWAY_BASE_URL}/{CURR_TIMESTAMP_API}"
+load_dotenv()
+
+# never print() from tools: the stdio transport owns stdout and stray prints
+# corrupt protocol frames (and can block the loop when the pipe backs up)
+logger = logging.getLogger("bus_mcp")
+
+# initialize the mcp server
+one_bus_away_api_key = os.getenv('ONE_BUS_AWAY_API_KEY')
+
+# shared read-only params for the common key-only calls (stop/{id}, route/{id})
+_AUTH_ONLY_PARAMS = MappingProxyType({"key": one_bus_away_api_key})
+
+def _require_api_key() -> str:
+    """Fail fast with a clear error when the API key is not configured
+
+    Without this, a missing key surfaces as an opaque TypeError from deep
+    inside the URL builder on the first tool call.
+    """
+    if not one_bus_away_api_key:
+        raise RuntimeError(
+            "ONE_BUS_AWAY_API_KEY is not configured; set it in the environment or a .env file"
+        )
+    return one_bus_away_api_key
+
+@asynccontextmanager
+async def _lifespan(server):
+    """Warm DNS, TCP, and TLS for the upstream hosts before the first tool call
+
+    One cheap request per host at boot means the first real tool call finds a
+    resolved hostname and a pooled warm connection instead of a cold handshake.
+    """
+    # surface a misconfigured key at boot rather than on the first tool call
+    api_key = _require_api_key()
+    session = await _get_session()
+    try:
+        async with session.get(CURR_TIME_URL, params={"key": api_key}) as response:
+            await response.read()
+        async with session.head("https://nominatim.openstreetmap.org/"):
+            pass
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        # warmup is best-effort; real calls reconnect on demand
+        pass
+    try:
+        yield
+    finally:
+        if _session is not None and not _session.closed:
+            await _session.close()
+
+mcp = FastMCP("One Bus Away MCP Server", lifespan=_lifespan)
+
+# location class
+class Location(NamedTuple):
+    """Location class"""
+    latitude: float
+    longitude: float
+
+# mean earth radius in meters
+EARTH_RADIUS_M = 6371008.8
+
+def haversine_meters(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Haversine distance from one point to arrays of lats/lons, in meters
+
+    Args:
+        lat (float): Origin latitude
+        lon (float): Origin longitude
+        lats (np.ndarray): Destination latitudes
+        lons (np.ndarray): Destination longitudes
+
+    Returns:
+        np.ndarray: Distance in meters to each destination
+    """
+    dlat = np.radians(lats - lat)
+    dlon = np.radians(lons - lon)
+    a = np.sin(dlat / 2) ** 2 + np.cos(np.radians(lat)) * np.cos(np.radians(lats)) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+# stop/route metadata rarely changes, so cache those endpoints for an hour;
+# arrivals-and-departures and current-time stay uncached (real-time data)
+_CACHEABLE_ENDPOINTS = (
+    "stop/",
+    "route/",
+    "stops-for-route/",
+    "routes-for-location.json",
+    "stops-for-location.json",
+)
+_CACHE = TTLCache(maxsize=1024, ttl=3600)
+_CACHE_LOCK = asyncio.Lock()
+
+# geocoding results never change, so memoize them; the semaphore serializes
+# cache misses to respect Nominatim's 1 request/second policy
+_GEOCODE_CACHE = LRUCache(maxsize=4096)
+_NOMINATIM_SEM = asyncio.Semaphore(1)
+
+# shared aiohttp session, created lazily on the first call
+_session: Optional[aiohttp.ClientSession] = None
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Get (or lazily create) the shared aiohttp session
+
+    The session keeps pooled keep-alive connections so repeated calls to the
+    same host skip the TCP+TLS handshake.
+    """
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=20,
+            limit_per_host=10,
+            keepalive_timeout=60,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=10),
+            # OneBusAway JSON compresses to ~15-20% of its size; explicitly
+            # advertise gzip and decompress transparently on the way in
+            headers={"Accept-Encoding": "gzip, deflate"},
+            auto_decompress=True,
+        )
+    return _session
+
+# make api calls
+async def _one_bus_away_get_raw(endpoint: str, params: Dict[str, Any] = None) -> bytes:
+    """Fetch a One Bus Away endpoint and return the raw response body bytes
+
+    Args:
+        endpoint (str): The endpoint to call
+        params (Dict[str, Any]): The parameters to pass to the endpoint
+
+    Returns:
+        bytes: The decompressed response body
+    """
+    _require_api_key()
+    if not params:
+        # key-only fast path: reuse the shared read-only mapping
+        params = _AUTH_ONLY_PARAMS
+    else:
+        # copy rather than mutating the caller-owned dict
+        params = {**params, "key": one_bus_away_api_key}
+    url = f"{ONE_BUS_AWAY_BASE_URL}/where/{endpoint}"
+    session = await _get_session()
+    async with session.get(url, params=params) as response:
+        if response.status != 200:
+            body = await response.text()
+            raise aiohttp.ClientResponseError(
+                response.request_info,
+                response.history,
+                status=response.status,
+                message=f"Failed to make API call to {url} with status code {response.status}: {body}",
+            )
+        return await response.read()
+
+async def make_one_bus_away_api_call(endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Make One Bus Away API call
+    Args:
+        endpoint (str): The endpoint to call
+        params (Dict[str, Any]): The parameters to pass to the endpoint
+
+    Returns:
+        Dict[str, Any]: The response from the endpoint
+    """
+    if params is None:
+        params = {}
+
+    # check the cache before issuing any HTTP for static metadata endpoints
+    cache_key = None
+    if endpoint.startswith(_CACHEABLE_ENDPOINTS):
+        cache_key = (endpoint, frozenset(params.items()))
+        async with _CACHE_LOCK:
+            cached = _CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+    result = json_loads(await _one_bus_away_get_raw(endpoint, params))
+
+    if cache_key is not None:
+        async with _CACHE_LOCK:
+            _CACHE[cache_key] = result
+    return result
+
+
+@mcp.tool(description="MCP Tool to print hello world")
+async def print_hello(input_name: str) -> str:
+    """Small MCP Tool
+
+    Args:
+        input_name (str): String to print out
+
+    Returns:
+        str: Greeting message
+    """
+    logger.debug("Hello %s!", input_name)
+    return f"Hello {input_name}!"
+
+
+@mcp.tool(description="Convert address to latitude/longitude coordinates")
+async def geocode_address(address: str) -> Dict[str, Any]:
+    """Convert an address to latitude/longitude coordinates using free OpenStreetMap Nominatim API
+
+    Args:
+        address (str): Street address to geocode
+
+    Returns:
+        Dict[str, Any]: Dict containing lat, lon, and formatted address
+    """
+    # repeated addresses are common when an LLM re-asks, so serve them from cache
+    cached = _GEOCODE_CACHE.get(address)
+    if cached is not None:
+        return cached
+
+    # use openstreetmap's nominatim API (no need for API key)
+    url = "https://nominatim.openstreetmap.org/search"
+    params = {
+        "q": address,
+        "format": "json",
+        "limit": 1,
+        "addressdetails": 1,
+    }
+
+    headers = {
+        "User-Agent": "bus-mcp/1.0"
+    }
+
+    async with _NOMINATIM_SEM:
+        try:
+            session = await _get_session()
+            async with session.get(url, params=params, headers=headers) as response:
+                if response.status == 200:
+                    data = await response.json(loads=json_loads)
+                else:
+                    raise aiohttp.ClientResponseError(
+                        response.request_info,
+                        response.history,
+                        status=response.status,
+                        message=f"Geocoding request failed: {response.status}",
+                    )
+        finally:
+            # space out misses to stay within nominatim's terms of service --
+            # also on failures, which is exactly when they are throttling us;
+            # cache hits above never wait here
+            await asyncio.sleep(1)
+
+    if data and len(data) > 0:
+        result = data[0]
+        geocoded = {
+            "lat": float(result['lat']),
+            "lon": float(result['lon']),
+            "formatted_address": result['display_name']
+        }
+    else:
+        geocoded = {"error": "Address not found"}
+    _GEOCODE_CACHE[address] = geocoded
+    return geocoded
+    
+@mcp.tool(description="Find bus stops near a given location")
+async def find_stops_near_location(lat: float, lon: float, radius: int = 500) -> Dict[str, Any]:
+    """Find bus stops near a given location
+
+    Args:
+        lat (float): Location latitude
+        lon (float): Location longitude
+        radius (int, optional): Search radius in meters. Defaults to 500.
+
+    Returns:
+        Dict[str, Any]: List of bus stops within the search radius
+    """
+    initial_location= Location(latitude=lat, longitude=lon)
+    params = {
+        "lat": lat,
+        "lon": lon,
+        "radius": radius
+    }
+    
+    response = await make_one_bus_away_api_call("stops-for-location.json", params)
+
+    # get data
+    stops = response.get("data", {}).get("list", [])
+
+    # one vectorized haversine over all stops instead of a geodesic call per stop
+    names = [stop["name"] for stop in stops]
+    lats = np.fromiter((stop["lat"] for stop in stops), dtype=np.float64, count=len(stops))
+    lons = np.fromiter((stop["lon"] for stop in stops), dtype=np.float64, count=len(stops))
+    distances = haversine_meters(lat, lon, lats, lons)
+
+    ditance_between_stops_response = [{
+        "initial_location": initial_location,
+        "stop_name": name,
+        "stop_location": Location(stop_lat, stop_lon),
+        "distance_meters": distance
+    } for name, stop_lat, stop_lon, distance in zip(names, lats.tolist(), lons.tolist(), distances.tolist())]
+
+    # response should have a name, lat, long, distance
+    return ditance_between_stops_response
+    
+@mcp.tool(description="Get information about a bus stop")
+async def get_stop_details(stop_id: str) -> Dict[str, Any]:
+    """Get information about a bus stop
+
+    Args:
+        stop_id (str): OneBusAway stop ID
+
+    Returns:
+        Dict[str, Any]: Bus stop info
+    """
+    result = await make_one_bus_away_api_call(f"stop/{stop_id}.json")
+    return result
+
+def _project_arrivals(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Project a raw arrivals payload down to the fields the tools advertise"""
+    arrivals = payload.get("data", {}).get("entry", {}).get("arrivalsAndDepartures", [])
+    return [{
+        "route": a.get("routeShortName"),
+        "headsign": a.get("tripHeadsign"),
+        "stop_id": a.get("stopId"),
+        "predicted_arrival_ms": a.get("predictedArrivalTime"),
+        "scheduled_arrival_ms": a.get("scheduledArrivalTime"),
+    } for a in arrivals]
+
+@mcp.tool(description="Get real-time arrival and departure information for a stop")
+async def get_stop_arrivals(stop_id: str, minutes_ahead: int = 15) -> Dict[str, Any]:
+    """Get real-time arrival and departure information for a stop
+
+    Args:
+        stop_id (str): OneBusAway stop ID
+        minutes_ahead (int): How many minutes ahead to look (default: 15).
+            Larger windows are roughly linearly slower to transfer and parse,
+            so ask only for the window you need.
+
+    Returns:
+        Dict with the stop id and a list of projected arrivals (route,
+        headsign, predicted/scheduled arrival times)
+    """
+    params = {
+        "minutesBefore": 0,  # the server-side default includes 5 minutes of past arrivals
+        "minutesAfter": minutes_ahead
+    }
+
+    result = await make_one_bus_away_api_call(ARRIVALS_AND_DEPARTURES_API.format(stop_id=stop_id), params)
+    # return only the advertised fields, not the raw payload with all its
+    # references/polylines -- everything returned here gets re-serialized
+    # into the model context
+    return {"stop_id": stop_id, "arrivals": _project_arrivals(result)}
+
+def _project_routes(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Project a raw routes payload down to the fields the tools advertise"""
+    routes = payload.get("data", {}).get("list", [])
+    return [{
+        "route_id": r.get("id"),
+        "short_name": r.get("shortName"),
+        "long_name": r.get("longName"),
+        "description": r.get("description"),
+        "agency_id": r.get("agencyId"),
+    } for r in routes]
+
+@mcp.tool(description="Find bus routes operating near a location")
+async def find_routes_near_location(lat: float, lon: float, radius: int = 1000) -> Dict[str, Any]:
+    """Find bus routes operating near a location
+
+    Args:
+        lat (float): Latitude
+        lon (float): Longitude
+        radius (int): Search radius in meters (default: 1000)
+
+    Returns:
+        Dict with a list of projected routes (id, names, description, agency)
+    """
+    params = {
+        "lat": lat,
+        "lon": lon,
+        "radius": radius
+    }
+
+    result = await make_one_bus_away_api_call("routes-for-location.json", params)
+    return {"routes": _project_routes(result)}
+
+@mcp.tool(description="Get detailed information about a specific route")
+async def get_route_details(route_id: str) -> Dict[str, Any]:
+    """Get detailed information about a specific route
+    
+    Args:
+        route_id (str): OneBusAway route ID
+        
+    Returns:
+        Dict containing route details
+    """
+    result = await make_one_bus_away_api_call(f"route/{route_id}.json")
+    return result
+
+@mcp.tool(description="Get all stops served by a specific route")
+async def get_route_stops(route_id: str, include_polylines: bool = False) -> Dict[str, Any]:
+    """Get all stops served by a specific route
+    
+    Args:
+        route_id (str): OneBusAway route ID
+        include_polylines (bool): Include route geometry (default: False)
+        
+    Returns:
+        Dict containing stops on the route
+    """
+    params = {
+        "includePolylines": str(include_polylines).lower()
+    }
+    
+    result = await make_one_bus_away_api_call(f"stops-for-route/{route_id}.json", params)
+    return result
+
+# TODO: Get reachable stops from a location
+# TODO: Add tool to plan a trip between two locations
+# TODO: Add tool to get agency coverage
+    
+@mcp.tool(description="MCP Tool to get the current time")
+async def get_current_time() -> Dict[str, Any]:
+    session = await _get_session()
+    # params= lets the client URL-encode the key instead of hand-building the query string
+    async with session.get(CURR_TIME_URL, params={"key": _require_api_key()}) as response:
+        result = await response.json(loads=json_loads)
+    logger.debug("result: %s", result)
+    return result
+
+@mcp.tool(description="MCP Tool to get the next bus stops from a provided bus stop_id in the Puget Sound, Washington Area")
+async def get_next_stop(stop_id, milliseconds_since_epoch: Optional[int] = None, minutes_ahead = 15, minutes_before = 0) ->set:
+    # a time.time() default would be frozen at import, so resolve "now" per call
+    if milliseconds_since_epoch is None:
+        milliseconds_since_epoch = time.time_ns() // 1_000_000
+    params = {
+        "minutesBefore": minutes_before,
+        "minutesAfter": minutes_ahead,
+        "time": milliseconds_since_epoch
+    }
+    endpoint = ARRIVALS_AND_DEPARTURES_API.format(stop_id=stop_id)
+    if os.getenv("BUS_MCP_DEBUG_DUMP"):
+        # the debug dump needs the full dict, so parse everything and write
+        # it in the background so it never blocks the return
+        result = await make_one_bus_away_api_call(endpoint, params)
+        task = asyncio.create_task(_dump_arrivals(stop_id, result))
+        # hold a reference so the task can't be garbage-collected mid-write
+        _DUMP_TASKS.add(task)
+        task.add_done_callback(_dump_task_done)
+        next_stops = {entry["tripStatus"]["nextStop"] for entry in result["data"]["entry"]["arrivalsAndDepartures"]}
+    else:
+        # only a few dozen strings are consumed out of a payload that can run
+        # to hundreds of KB; stream-parse instead of building the whole tree
+        raw = await _one_bus_away_get_raw(endpoint, params)
+        next_stops = {
+            value
+            for key, value in ijson.kvitems(raw, "data.entry.arrivalsAndDepartures.item.tripStatus")
+            if key == "nextStop"
+        }
+    logger.debug("next_stops: %s", next_stops)
+    return next_stops
+
+# in-flight debug dump tasks, kept alive until their done-callback fires
+_DUMP_TASKS = set()
+
+def _dump_task_done(task: asyncio.Task) -> None:
+    _DUMP_TASKS.discard(task)
+    exc = task.exception()
+    if exc is not None:
+        logger.warning("arrivals debug dump failed: %s", exc)
+
+async def _dump_arrivals(stop_id: str, result: Dict[str, Any]) -> None:
+    """Write the raw arrivals payload to disk for offline debugging"""
+    write_file_path = f"random_files/{stop_id}_arrivals_and_departures.json"
+    os.makedirs(os.path.dirname(write_file_path), exist_ok=True)
+    async with aiofiles.open(write_file_path, "wb") as f:
+        await f.write(json_dumps(result))
+
+async def sample_get_next_stops(stop):
+    value = ""
+    if stop == "S":
+        value  = ["B", "A", "D"]
+    if stop == "A":
+        value = ["C","F","B"]
+    if stop =="B":
+        value = ["E"]
+    if stop == "C":
+        value = ["E"]
+    if stop == "D":
+        value = ["E"]
+    if stop == "F":
+        value = ["D"]
+    return value
+        
+async def find_path(start_stop, end_stop):
+    frontier = [start_stop]
+    stops_to_here = {} #dict of stops to a set of all the stops that could get you to key_stop.
+    visited = set()
+    enqueued = {start_stop} #every stop enters a frontier at most once, bounds the queue to |V|
+    while frontier:
+        # fetch the whole BFS frontier concurrently, latency = max(RTT) not sum(RTT)
+        logger.debug("frontier: %s", frontier)
+        results = await asyncio.gather(*[sample_get_next_stops(stop) for stop in frontier])
+        next_frontier = []
+        for stop, next_stops in zip(frontier, results):
+            visited.add(stop)
+            for next_stop in next_stops:
+                if next_stop not in stops_to_here:
+                    stops_to_here[next_stop] = set()
+                stops_to_here[next_stop].add(stop)
+                if next_stop not in visited and next_stop not in enqueued:
+                    enqueued.add(next_stop)
+                    next_frontier.append(next_stop)
+        frontier = next_frontier
+    logger.debug("stops_to_here: %s", stops_to_here)
+    paths  = backtrack(stops_to_here,start_stop,end_stop)
+    logger.debug("paths: %s", ["->".join(path) for path in paths])
+    # backtrack
+
+def backtrack(stops_to_here: Dict, start_stop, end_stop) -> List[List[str]]:
+    """Enumerate all paths from start_stop to end_stop by walking the predecessor map
+
+    Iterative DFS with an explicit stack, so deep graphs don't hit the
+    recursion limit; paths are built as lists (O(1) append) and only
+    joined into strings at the boundary.
+    """
+    paths = []
+    stack = [(end_stop, [end_stop])]
+    while stack:
+        curr_stop, path = stack.pop()
+        if curr_stop == start_stop:
+            paths.append(list(reversed(path)))
+            continue
+        for prev_stop in stops_to_here.get(curr_stop, ()):
+            if prev_stop not in path: #don't loop through cycles
+                stack.append((prev_stop, path + [prev_stop]))
+    return paths
+
+
+
+
+
+# test bed
+async def main():
+    global _session
+    # independent calls, so batch them instead of awaiting one at a time
+    await asyncio.gather(
+        print_hello("This is a test"),
+        get_current_time(),
+        get_next_stop("1_75403"),
+    )
+    # the session is bound to this loop, which asyncio.run is about to close;
+    # drop it so the following mcp.run() builds a fresh one on its own loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    logger.debug("I am in here")
+    asyncio.run(main())
+    # asyncio.run(find_path("S","E"))
+    mcp.run()